@@ -1,12 +1,18 @@
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import firebase_admin
 from firebase_admin import credentials, firestore, auth, exceptions
+from google.api_core.exceptions import GoogleAPIError
 import pandas as pd
+import numpy as np
 from datetime import date, timedelta
 import plotly.express as px
 from PIL import Image
 import io
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from enum import IntEnum
 
 # Set the page to wide layout at the very beginning of the script
 st.set_page_config(layout="wide")
@@ -16,34 +22,35 @@ st.set_page_config(layout="wide")
 # and various visualization and analysis features.
 
 # --- Firebase Setup (MANDATORY) ---
-try:
-    # Use st.secrets to access the Firebase configuration for deployment
-    firebase_config = st.secrets["firebase"]
-    
-    # Correctly parse the private key from secrets to handle multiline strings
-    # This creates a dictionary to pass to the credentials function.
-    creds_dict = {
-        "type": firebase_config["type"],
-        "project_id": firebase_config["project_id"],
-        "private_key_id": firebase_config["private_key_id"],
-        "private_key": firebase_config["private_key"],
-        "client_email": firebase_config["client_email"],
-        "client_id": firebase_config["client_id"],
-        "auth_uri": firebase_config["auth_uri"],
-        "token_uri": firebase_config["token_uri"],
-        "auth_provider_x509_cert_url": firebase_config["auth_provider_x509_cert_url"],
-        "client_x509_cert_url": firebase_config["client_x509_cert_url"],
-    }
-    
-    cred = credentials.Certificate(creds_dict)
+@st.cache_resource
+def get_db():
+    """Initializes the Firebase app once per process and returns the Firestore client."""
     if not firebase_admin._apps:
+        # Use st.secrets to access the Firebase configuration for deployment.
+        # The [firebase] table holds the service-account fields Certificate expects.
+        cred = credentials.Certificate(dict(st.secrets["firebase"]))
         firebase_admin.initialize_app(cred)
-    db = firestore.client()
+    return firestore.client()
+
+try:
+    db = get_db()
 except Exception as e:
     st.error(f"Error initializing Firebase. Please ensure your firebase_config is correct and is saved as a secrets.toml file in the .streamlit directory. Details: {e}")
     st.stop()
 # End of Firebase Setup
 
+# The dashboard only plots recent activity; older records are paged in from the history tab.
+RECENT_DAYS = 90
+RECENT_LIMIT = 500
+HISTORY_PAGE_SIZE = 50
+
+# Fields the app actually reads; queries project onto these so nothing else is transferred.
+TRANSACTION_FIELDS = ['date', 'description', 'amount', 'category']
+LENDING_FIELDS = ['date', 'person', 'amount', 'type']
+
+# Firestore accepts at most 500 writes in a single batch commit.
+FIRESTORE_BATCH_LIMIT = 500
+
 def get_current_user_id():
     """Returns the current user's ID from session state."""
     return st.session_state.get('user_id')
@@ -99,14 +106,94 @@ def add_transaction(user_id, transaction_date, description, amount, category):
         'amount': amount,
         'category': category
     })
-
+    clear_transaction_caches(user_id)
+
+class BulkWriteError(Exception):
+    """Raised when a bulk write fails part-way; the first `committed` records were already saved."""
+    def __init__(self, committed, cause):
+        super().__init__(f"{committed} record(s) were saved before the write failed: {cause}")
+        self.committed = committed
+
+def add_transactions_bulk(user_id, transactions):
+    """Inserts many transaction records for a user with batched writes, one commit per 500 records."""
+    transactions_ref = db.collection('users').document(user_id).collection('transactions')
+    committed = 0
+    try:
+        for start in range(0, len(transactions), FIRESTORE_BATCH_LIMIT):
+            chunk = transactions[start:start + FIRESTORE_BATCH_LIMIT]
+            batch = db.batch()
+            for transaction in chunk:
+                batch.set(transactions_ref.document(), transaction)
+            batch.commit()
+            committed += len(chunk)
+    except GoogleAPIError as e:
+        # Batches are atomic individually but not together, so earlier ones may already be saved
+        raise BulkWriteError(committed, e) from e
+    finally:
+        # Clear even on failure so the dashboard shows whatever did get committed
+        clear_transaction_caches(user_id)
+
+def clear_transaction_caches(user_id):
+    """Drops cached transaction data so the next rerun picks up newly written records."""
+    get_transactions_df.clear(user_id)
+    get_transaction_totals.clear(user_id)
+    st.session_state.pop('history_docs', None)
+    st.session_state.pop('history_exhausted', None)
+
+@st.cache_data(ttl=300, show_spinner=False)
 def get_transactions_df(user_id):
-    """Fetches all transactions for a user from Firestore and returns them as a DataFrame."""
-    docs = db.collection('users').document(user_id).collection('transactions').stream()
-    data = [doc.to_dict() for doc in docs]
-    if not data:
+    """Fetches a user's transactions from the last RECENT_DAYS days and returns them as a DataFrame."""
+    cutoff = (date.today() - timedelta(days=RECENT_DAYS)).isoformat()
+    query = (
+        db.collection('users').document(user_id).collection('transactions')
+        .select(TRANSACTION_FIELDS)
+        .where(filter=firestore.FieldFilter('date', '>=', cutoff))
+        .order_by('date')
+        .limit_to_last(RECENT_LIMIT)
+    )
+    # limit_to_last queries cannot be streamed, so fetch the whole page at once
+    docs = query.get()
+    if not docs:
         return pd.DataFrame()
-    return pd.DataFrame(data)
+    # get() already returned every document, so fill preallocated column arrays of the exact size.
+    # ISO date strings parse straight into datetime64 and category names go in as int8 codes.
+    n = len(docs)
+    dates = np.empty(n, dtype='datetime64[D]')
+    descriptions = np.empty(n, dtype=object)
+    amounts = np.empty(n, dtype=np.float64)
+    category_codes = np.empty(n, dtype=np.int8)
+    for i, doc in enumerate(docs):
+        record = doc.to_dict()
+        dates[i] = record.get('date')
+        descriptions[i] = record.get('description')
+        amounts[i] = record.get('amount', np.nan)
+        category_codes[i] = CATEGORY_CODES.get(record.get('category'), -1)
+    return pd.DataFrame({
+        'date': dates,
+        'description': descriptions,
+        'amount': amounts,
+        'category': pd.Categorical.from_codes(category_codes, categories=CATEGORIES),
+    })
+
+@st.cache_data(ttl=300, show_spinner=False)
+def get_transaction_totals(user_id):
+    """Returns a user's all-time (income, expenses) totals using server-side sum aggregations."""
+    transactions_ref = db.collection('users').document(user_id).collection('transactions')
+    income = transactions_ref.where(filter=firestore.FieldFilter('amount', '>', 0)).sum('amount').get()
+    expenses = transactions_ref.where(filter=firestore.FieldFilter('amount', '<', 0)).sum('amount').get()
+    return income[0][0].value or 0, expenses[0][0].value or 0
+
+def get_transactions_page(user_id, start_after=None):
+    """Fetches one page of a user's transactions, newest first, after the given document snapshot."""
+    query = (
+        db.collection('users').document(user_id).collection('transactions')
+        .select(TRANSACTION_FIELDS)
+        .order_by('date', direction=firestore.Query.DESCENDING)
+        .limit(HISTORY_PAGE_SIZE)
+    )
+    if start_after is not None:
+        query = query.start_after(start_after)
+    return list(query.stream())
 
 def add_lending_loan(user_id, lending_date, person, amount, loan_type):
     """Inserts a new lending or loan record for a user into Firestore."""
@@ -117,33 +204,136 @@ def add_lending_loan(user_id, lending_date, person, amount, loan_type):
         'amount': amount,
         'type': loan_type
     })
+    # Drop the cached copy so the next rerun picks up the new record
+    get_lending_loan_df.clear(user_id)
 
+@st.cache_data(ttl=300, show_spinner=False)
 def get_lending_loan_df(user_id):
     """Fetches all lending/loan records for a user and returns them as a DataFrame."""
-    docs = db.collection('users').document(user_id).collection('lending_loan').stream()
-    data = [doc.to_dict() for doc in docs]
-    if not data:
+    docs = db.collection('users').document(user_id).collection('lending_loan').select(LENDING_FIELDS).stream()
+    # Collect each field into its own list and build the frame column-wise
+    dates, persons, amounts, loan_types = [], [], [], []
+    for doc in docs:
+        record = doc.to_dict()
+        dates.append(record.get('date'))
+        persons.append(record.get('person'))
+        amounts.append(record.get('amount'))
+        loan_types.append(record.get('type'))
+    if not dates:
         return pd.DataFrame()
-    return pd.DataFrame(data)
+    return pd.DataFrame({
+        'date': dates,
+        'person': persons,
+        'amount': np.asarray(amounts, dtype=np.float64),
+        'type': pd.Categorical(loan_types),
+    })
 
 # --- Keyword-based Categorization ---
+# Fixed category list; the category column is a Categorical over it, so pandas stores int8 codes.
+# CATEGORIES doubles as the display-name table for Category: CATEGORIES[Category.FOOD] == "Food".
+CATEGORIES = ["Food", "Transport", "Shopping", "Bills", "Entertainment", "Trip", "Education/Fees", "Services", "Other"]
+CATEGORY_CODES = {name: code for code, name in enumerate(CATEGORIES)}
+
+class Category(IntEnum):
+    """Transaction categories; each value is the category's code in the category column."""
+    FOOD = 0
+    TRANSPORT = 1
+    SHOPPING = 2
+    BILLS = 3
+    ENTERTAINMENT = 4
+    TRIP = 5
+    EDUCATION_FEES = 6
+    SERVICES = 7
+    OTHER = 8
+
+# Both tables index the same int8 codes, so member order and names must match CATEGORIES exactly
+assert [c.name for c in Category] == [re.sub(r'\W+', '_', name).upper() for name in CATEGORIES]
+
+# Expense categories counted as avoidable in the good vs. bad analysis
+BAD_CATEGORIES = (Category.ENTERTAINMENT, Category.FOOD, Category.TRIP)
+
+# Built once per script run rather than on every call; categories are checked in order and the first match wins.
+CATEGORY_KEYWORDS = {
+    Category.FOOD: ("restaurant", "cafe", "groceries", "supermarket", "food", "eat"),
+    Category.TRANSPORT: ("gas", "fuel", "bus", "train", "uber", "cab"),
+    Category.SHOPPING: ("store", "online", "amazon", "mall", "clothes"),
+    Category.BILLS: ("rent", "utility", "phone bill", "electricity"),
+    Category.ENTERTAINMENT: ("movie", "cinema", "concert", "game"),
+    Category.TRIP: ("flight", "hotel", "travel", "vacation"),
+    Category.EDUCATION_FEES: ("fees", "tuition", "school", "college", "university"),
+    Category.SERVICES: ("service", "repair", "instrument", "maintenance", "repare", "charge"),
+}
+
+# All keywords compiled into one regex: each category is a lookahead branch followed by an
+# empty group, so the match is decided in a single C-level call and m.lastindex names the
+# first category (in table order) that has a keyword anywhere in the description.
+_PATTERN_CATEGORIES = tuple(CATEGORY_KEYWORDS)
+_CATEGORY_PATTERN = re.compile(
+    "|".join(
+        "(?=.*?(?:{}))()".format("|".join(re.escape(term) for term in terms))
+        for terms in CATEGORY_KEYWORDS.values()
+    ),
+    re.DOTALL,
+)
+
 def suggest_category(description):
-    """Suggests a category based on keywords in the description."""
-    keywords = {
-        "Food": ["restaurant", "cafe", "groceries", "supermarket", "food", "eat"],
-        "Transport": ["gas", "fuel", "bus", "train", "uber", "cab"],
-        "Shopping": ["store", "online", "amazon", "mall", "clothes"],
-        "Bills": ["rent", "utility", "phone bill", "electricity"],
-        "Entertainment": ["movie", "cinema", "concert", "game"],
-        "Trip": ["flight", "hotel", "travel", "vacation"],
-        "Education/Fees": ["fees", "tuition", "school", "college", "university"],
-        "Services": ["service", "repair", "instrument", "maintenance", "repare", "charge"]
-    }
-    desc = description.lower()
-    for category, terms in keywords.items():
-        if any(term in desc for term in terms):
-            return category
-    return "Other"
+    """Suggests a Category based on keywords in the description."""
+    match = _CATEGORY_PATTERN.match(description.lower())
+    return _PATTERN_CATEGORIES[match.lastindex - 1] if match else Category.OTHER
+
+def suggest_categories(descriptions):
+    """Suggests a category name for every description in a Series, running the matcher once per distinct description."""
+    lowered = descriptions.str.lower()
+    return lowered.map({desc: CATEGORIES[suggest_category(desc)] for desc in lowered.unique()})
+
+# --- CSV Import ---
+def parse_transactions_csv(csv_file):
+    """Reads an uploaded CSV into transaction records for add_transactions_bulk; raises ValueError on bad input."""
+    df = pd.read_csv(csv_file)
+    missing = {'date', 'description', 'amount'} - set(df.columns)
+    if missing:
+        raise ValueError(f"missing column(s): {', '.join(sorted(missing))}")
+    if df.empty:
+        raise ValueError("the file has no transaction rows")
+
+    # Parse with the one format we document; guessing would silently read dd/mm as mm/dd
+    try:
+        dates = pd.to_datetime(df['date'], format='%Y-%m-%d').dt.strftime('%Y-%m-%d')
+    except ValueError:
+        raise ValueError("dates must be YYYY-MM-DD") from None
+    if dates.isna().any():
+        raise ValueError("every row needs a date")
+    descriptions = df['description'].fillna('').astype(str)
+    if (descriptions.str.strip() == '').any():
+        raise ValueError("every row needs a description")
+    amounts = pd.to_numeric(df['amount'])
+    if amounts.isna().any():
+        raise ValueError("every row needs an amount")
+
+    # Same rule as the form: suggest for expenses, default income to "Other"; a valid CSV category wins
+    suggested = suggest_categories(descriptions).where(amounts < 0, "Other")
+    if 'category' in df.columns:
+        categories = df['category'].where(df['category'].isin(CATEGORIES), suggested)
+    else:
+        categories = suggested
+
+    return [
+        {'date': transaction_date, 'description': description, 'amount': float(amount), 'category': category}
+        for transaction_date, description, amount, category in zip(dates, descriptions, amounts, categories)
+    ]
+
+# --- Cached Chart Builders ---
+# Streamlit hashes the (small, already aggregated) chart data, so a rerun with unchanged
+# data reuses the stored figure instead of rebuilding it through plotly express.
+@st.cache_data(max_entries=64, show_spinner=False)
+def bar_chart(data, **kwargs):
+    """Returns a plotly express bar chart, cached on its data and arguments."""
+    return px.bar(data, **kwargs)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def pie_chart(data, **kwargs):
+    """Returns a plotly express pie chart, cached on its data and arguments."""
+    return px.pie(data, **kwargs)
 
 # --- Main App Dashboard ---
 def main_app(user_id):
@@ -163,8 +353,15 @@ def main_app(user_id):
         unsafe_allow_html=True
     )
     
-    transactions_df = get_transactions_df(user_id)
-    lending_df = get_lending_loan_df(user_id)
+    # Fetch the recent transactions, the all-time totals and the lending records concurrently;
+    # the worker threads share this run's script context so the cached getters behave as if called inline.
+    with ThreadPoolExecutor(max_workers=3, initializer=add_script_run_ctx, initargs=(None, get_script_run_ctx())) as executor:
+        transactions_future = executor.submit(get_transactions_df, user_id)
+        totals_future = executor.submit(get_transaction_totals, user_id)
+        lending_future = executor.submit(get_lending_loan_df, user_id)
+        transactions_df = transactions_future.result()
+        total_income, total_expenses = totals_future.result()
+        lending_df = lending_future.result()
 
     # --- Top Row: Title and Summary ---
     title_col, summary_col = st.columns([1, 1])
@@ -173,8 +370,6 @@ def main_app(user_id):
     with summary_col:
         st.subheader("📊 Overall Summary")
 
-        total_income = transactions_df[transactions_df['amount'] > 0]['amount'].sum() if not transactions_df.empty else 0
-        total_expenses = transactions_df[transactions_df['amount'] < 0]['amount'].sum() if not transactions_df.empty else 0
         net_balance = total_income + total_expenses  # because expenses are negative
         total_lent = lending_df[lending_df['type'] == 'Lent']['amount'].sum() if not lending_df.empty else 0
         total_loan = lending_df[lending_df['type'] == 'Loan']['amount'].sum() if not lending_df.empty else 0
@@ -197,69 +392,72 @@ def main_app(user_id):
             transaction_type = st.selectbox("Type", ["Expense", "Income"])
             amount_input = st.number_input("Amount", min_value=0.01, format="%.2f")
             description = st.text_input("Description")
-            
 
-            # Updated list of categories
-            categories = ["Food", "Transport", "Shopping", "Bills", "Entertainment", "Trip", "Education/Fees", "Services", "Other"]
-            
-            suggested_cat = suggest_category(description) if transaction_type == "Expense" else "Other" 
-            category = st.selectbox("Category", options=categories, index=categories.index(suggested_cat))
+            suggested_cat = suggest_category(description) if transaction_type == "Expense" else Category.OTHER
+            category = st.selectbox("Category", options=list(Category), index=suggested_cat, format_func=CATEGORIES.__getitem__)
 
             submitted = st.form_submit_button("Add Transaction")
 
             if submitted:
                 if description and amount_input:
                     amount = amount_input if transaction_type == "Income" else -amount_input
-                    add_transaction(user_id, str(transaction_date), description, amount, category)
+                    add_transaction(user_id, str(transaction_date), description, amount, CATEGORIES[category])
                     st.success(f"{transaction_type} added successfully!")
                     st.rerun()
                 else:
                     st.error("Please fill in the description and amount.")
+
+        with st.expander("📥 Import from CSV"):
+            st.caption("Columns: date (YYYY-MM-DD), description, amount (negative for expenses) and, optionally, category.")
+            # Bumping the key after an import gives a fresh, empty uploader, so the same file can't be imported twice
+            csv_file = st.file_uploader("CSV file", type="csv", key=f"csv_upload_{st.session_state.get('csv_upload_count', 0)}")
+            if csv_file is not None and st.button("Import Transactions"):
+                try:
+                    imported = parse_transactions_csv(csv_file)
+                except ValueError as e:
+                    st.error(f"Import failed: {e}")
+                else:
+                    try:
+                        add_transactions_bulk(user_id, imported)
+                    except BulkWriteError as e:
+                        st.error(f"Import stopped after {e.committed} of {len(imported)} transactions were saved: {e.__cause__}")
+                        if e.committed:
+                            # Some rows are already saved; reset the uploader so a retry can't duplicate them
+                            st.info(f"Remove the first {e.committed} rows from the file before importing it again.")
+                            st.session_state['csv_upload_count'] = st.session_state.get('csv_upload_count', 0) + 1
+                    else:
+                        st.success(f"Imported {len(imported)} transactions!")
+                        st.session_state['csv_upload_count'] = st.session_state.get('csv_upload_count', 0) + 1
+                        st.rerun()
     
     if not transactions_df.empty:
-        transactions_df['date'] = pd.to_datetime(transactions_df['date'])
-        transactions_df['week'] = transactions_df['date'].dt.to_period('W').astype(str)
-        transactions_df['month'] = transactions_df['date'].dt.to_period('M').astype(str)
+        expense_df = transactions_df[transactions_df['amount'] < 0].copy()
+        expense_df['amount'] = expense_df['amount'].abs()  # Convert to positive values for the charts
+        # A single date-indexed series feeds all three trend charts
+        expense_series = expense_df.set_index('date')['amount']
         
         with daily_col:
-            daily_expenses = transactions_df[transactions_df['amount'] < 0].groupby(transactions_df['date'].dt.date)['amount'].sum().reset_index()
-            daily_expenses['amount'] = daily_expenses['amount'].abs()
-            fig_daily = px.bar(daily_expenses, x='date', y='amount', title='Daily Expenses')
+            daily_expenses = expense_series.resample('D').sum().reset_index()
+            fig_daily = bar_chart(daily_expenses, x='date', y='amount', title='Daily Expenses')
             st.plotly_chart(fig_daily, use_container_width=True, config={'staticPlot': True})
 
         with weekly_col:
-            weekly_expenses = transactions_df[transactions_df['amount'] < 0].groupby('week')['amount'].sum().reset_index()
-            weekly_expenses['amount'] = weekly_expenses['amount'].abs()
-            fig_weekly = px.bar(weekly_expenses, x='week', y='amount', title='Weekly Expenses')
+            weekly_expenses = expense_series.resample('W').sum().reset_index()
+            fig_weekly = bar_chart(weekly_expenses, x='date', y='amount', title='Weekly Expenses')
             st.plotly_chart(fig_weekly, use_container_width=True, config={'staticPlot': True})
         
         with monthly_col:
-            monthly_expenses = transactions_df[transactions_df['amount'] < 0].groupby('month')['amount'].sum().reset_index()
-            monthly_expenses['amount'] = monthly_expenses['amount'].abs()
-            fig_monthly = px.bar(monthly_expenses, x='month', y='amount', title='Monthly Expenses')
+            monthly_expenses = expense_series.resample('MS').sum().reset_index()
+            fig_monthly = bar_chart(monthly_expenses, x='date', y='amount', title='Monthly Expenses')
             st.plotly_chart(fig_monthly, use_container_width=True, config={'staticPlot': True})
 
-        expense_df = transactions_df[transactions_df['amount'] < 0].copy()
-        expense_df['amount'] = expense_df['amount'].abs()  # Convert to positive values for the chart
-        all_categories = [
-            "Food",
-            "Transport",
-            "Shopping",
-            "Bills",
-            "Entertainment",
-            "Trip",
-            "Education/Fees",
-            "Services",
-            "Other"
-        ]    
-
-        category_expenses = expense_df.groupby('category')['amount'].sum().reset_index()
-        category_expenses = category_expenses.set_index('category').reindex(all_categories, fill_value=0).reset_index()
+        # observed=False keeps every category in CATEGORIES, with 0 for those without expenses
+        category_expenses = expense_df.groupby('category', observed=False)['amount'].sum().reset_index()
         # Display pie chart only if there are expenses recorded
         if category_expenses['amount'].sum() == 0:
             st.info("No expense data recorded for any category.")
         else:
-            fig_category_pie = px.pie(
+            fig_category_pie = pie_chart(
                 category_expenses,
                 names='category',
                 values='amount',
@@ -295,13 +493,14 @@ def main_app(user_id):
                     st.error("Please fill in the person's name and amount.")
 
     with lending_chart_col:
-        lending_df = get_lending_loan_df(user_id)
         if not lending_df.empty:
             st.subheader("Bar Chart of Money Lent vs. Loans Taken")
-            lending_df['date'] = pd.to_datetime(lending_df['date'])
-            lending_df['month'] = lending_df['date'].dt.to_period('M').astype(str)
-            monthly_lending_loan = lending_df.groupby(['month', 'type'])['amount'].sum().reset_index()
-            fig_lending = px.bar(monthly_lending_loan, x='month', y='amount', color='type', title='Monthly Money Lent vs. Loans', barmode='group')
+            lending_df['date'] = pd.to_datetime(lending_df['date'], format='%Y-%m-%d', cache=True)
+            # Group on integer yyyymm keys and turn only the aggregated rows back into dates for the axis
+            lending_month = (lending_df['date'].dt.year * 100 + lending_df['date'].dt.month).rename('month')
+            monthly_lending_loan = lending_df.groupby([lending_month, 'type'], observed=True)['amount'].sum().reset_index()
+            monthly_lending_loan['month'] = pd.to_datetime(monthly_lending_loan['month'], format='%Y%m')
+            fig_lending = bar_chart(monthly_lending_loan, x='month', y='amount', color='type', title='Monthly Money Lent vs. Loans', barmode='group')
             st.plotly_chart(fig_lending, use_container_width=True, config={'staticPlot': True})
         else:
             st.info("No lending or loan records to display.")
@@ -312,21 +511,19 @@ def main_app(user_id):
     goodbad_text_col, goodbad_chart_col = st.columns([1, 1])
     with goodbad_text_col:
         st.subheader("🤔 Good vs. Bad Expenses")
-        bad_categories = ["Entertainment", "Food", "Trip"]
         
         # Ensure transactions_df is not empty before filtering
         if not transactions_df.empty:
-            # Filter for expenses only (amount < 0)
-            expense_df = transactions_df[transactions_df['amount'] < 0].copy()
-            expense_df['amount'] = expense_df['amount'].abs()  # make all values positive
-            bad_expenses_df = expense_df[expense_df['category'].isin(bad_categories)]
-            good_expenses_df = expense_df[~expense_df['category'].isin(bad_categories)]
-            bad_expenses_amount = bad_expenses_df['amount'].sum()
-            good_expenses_amount = good_expenses_df['amount'].sum()
+            # Sum the (already positive) bad expenses through a boolean mask; good is the remainder
+            # Category codes equal Category values, so the mask compares small ints, not strings
+            is_bad = np.isin(expense_df['category'].cat.codes.to_numpy(), BAD_CATEGORIES)
+            expense_amounts = expense_df['amount'].to_numpy()
+            bad_expenses_amount = expense_amounts[is_bad].sum()
+            good_expenses_amount = expense_amounts.sum() - bad_expenses_amount
 
         else:
-            bad_expenses_df = 0
-            good_expenses_df = 0
+            bad_expenses_amount = 0
+            good_expenses_amount = 0
 
         # Prepare the summary DataFrame
         goodbad_summary = pd.DataFrame({
@@ -337,7 +534,7 @@ def main_app(user_id):
         if goodbad_summary['Amount'].sum() == 0:
             st.info("No expense data to analyze for good vs bad expenses.")
         else:
-            fig_goodbad_pie = px.pie(
+            fig_goodbad_pie = pie_chart(
                 goodbad_summary,
                 names='Expense Type',
                 values='Amount',
@@ -350,16 +547,6 @@ def main_app(user_id):
 
     with goodbad_text_col:
         st.subheader("🤔 Good vs. Bad Expenses")
-        bad_categories = ["Entertainment", "Food", "Trip"]
-
-        if not transactions_df.empty:
-            expense_df = transactions_df[transactions_df['amount'] < 0].copy()
-            expense_df['amount'] = expense_df['amount'].abs()
-            bad_expenses_amount = expense_df[expense_df['category'].isin(bad_categories)]['amount'].sum()
-
-        else:
-            bad_expenses_amount = 0
-
         st.markdown(f"**Total amount you could have saved:** ₹{bad_expenses_amount:,.2f}")
          # Actionable suggestion text
         suggestion_text = f"""
@@ -375,14 +562,28 @@ def main_app(user_id):
 
     # --- Display All Transactions and Lending/Loan Records at the bottom ---
     st.subheader("All Records")
-    tab1, tab2 = st.tabs(["🧾 Transactions", "🤝 Lending/Loans"])
+    tab1, tab2, tab3 = st.tabs(["🧾 Recent Transactions", "🗂️ Transaction History", "🤝 Lending/Loans"])
     with tab1:
         if not transactions_df.empty:
             st.dataframe(transactions_df, use_container_width=True)
         else:
-            st.info("No transactions recorded yet.")
+            st.info(f"No transactions recorded in the last {RECENT_DAYS} days.")
 
     with tab2:
+        # Pages are only fetched on request and kept in session state, so reruns cost nothing
+        history_docs = st.session_state.setdefault('history_docs', [])
+        if history_docs:
+            st.dataframe(pd.DataFrame([doc.to_dict() for doc in history_docs]), use_container_width=True)
+        if not st.session_state.get('history_exhausted'):
+            if st.button("Load older transactions" if history_docs else "Load transaction history"):
+                page = get_transactions_page(user_id, history_docs[-1] if history_docs else None)
+                history_docs.extend(page)
+                st.session_state['history_exhausted'] = len(page) < HISTORY_PAGE_SIZE
+                st.rerun()
+        elif not history_docs:
+            st.info("No transactions recorded yet.")
+
+    with tab3:
         if not lending_df.empty:
             st.dataframe(lending_df, use_container_width=True)
         else: